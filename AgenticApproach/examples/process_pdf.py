@@ -3,9 +3,16 @@ Maniflow Processing Script - Convert PDF to animated educational videos
 Accepts PDF path as command line argument
 """
 
+import argparse
+import importlib.util
+import logging
+import logging.handlers
 import os
+import queue
 import sys
 import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Force unbuffered output for real-time logging (Python 3.7+)
 try:
@@ -22,57 +29,72 @@ from google.genai import types as gemini_types
 from langchain_google_genai import ChatGoogleGenerativeAI
 from tqdm import tqdm
 
-from maniflow import ManiflowAnimationClient, ManiflowBreakdownClient
+from maniflow import (
+    AnimationResult,
+    Breakdown,
+    ManiflowAnimationClient,
+    ManiflowBreakdownClient,
+    TopicStoryboard,
+    cache,
+)
+from maniflow.prompts import BREAKDOWN_PROMPT, MANIM_CODING_AGENT_PROMPT, STORYBOARD_PROMPT, make_storyboard_formatter
 
+logger = logging.getLogger("process_pdf")
 
-def main(pdf_path: str):
+# Breakdowns, storyboards and finished animations from earlier runs, one folder per PDF
+CACHE_DIR = pathlib.Path("./.maniflow_cache")
+
+
+def start_log_listener() -> logging.handlers.QueueListener:
+    """Route this script's log lines through a queue drained by one thread.
+
+    Progress lines come from many worker threads; they only enqueue, and the
+    listener thread does the (line-buffered) writes to stdout in order.
+    """
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+
+def main(pdf_path: str, use_cache: bool = True):
     # Setup
-    print("=== Setup ===")
+    logger.info("=== Setup ===")
     load_dotenv()
 
     aistudio_gemini_api_key = os.environ.get('GOOGLE_API_KEY')
     if not aistudio_gemini_api_key:
         raise ValueError("GOOGLE_API_KEY environment variable is not set")
     
-    print(f"API Key: {aistudio_gemini_api_key[:3]}...{aistudio_gemini_api_key[-1:]}")
-    gemini_client = genai.Client(api_key=aistudio_gemini_api_key)
+    logger.info(f"API Key: {aistudio_gemini_api_key[:3]}...{aistudio_gemini_api_key[-1:]}")
+    # One keep-alive pool for the breakdown, storyboard and agent requests;
+    # HTTP/2 (when h2 is installed) multiplexes concurrent topics over it
+    http_client = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60),
+    )
+    gemini_client = genai.Client(
+        api_key=aistudio_gemini_api_key,
+        http_options=gemini_types.HttpOptions(httpx_client=http_client),
+    )
 
     MODEL_NAME = "gemini-3-pro-preview"
 
+    # Open the API connection (DNS, TLS) while the rest of setup runs; a
+    # metadata lookup is free, unlike a throwaway generate_content call
+    threading.Thread(target=gemini_client.models.get, kwargs={"model": MODEL_NAME}, daemon=True).start()
+
     # Validate PDF path
     pdf_file = pathlib.Path(pdf_path)
     if not pdf_file.exists():
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-    # Breakdown
-    print("\n=== Starting Breakdown ===")
-    maniflow_breakdown_client = ManiflowBreakdownClient(gemini_client)
-
-    breakdown_obj, raw_breakdown_response = maniflow_breakdown_client.breakdown(
-        file_path=pdf_file,
-        model=MODEL_NAME,
-        thinking_level="high"
-    )
-
-    print("Breakdown completed successfully!")
-
-    # Generate storyboards
-    print("\n=== Generating Storyboards ===")
-    storyboards = {}
-
-    for i, topic in tqdm(enumerate(breakdown_obj.topics), desc="Creating storyboards"):
-        storyboard_obj, raw_storyboard_response = maniflow_breakdown_client.storyboard(
-            topic=topic,
-            model=MODEL_NAME,
-            thinking_level="high",
-            source_file=str(pdf_file)
-        )
-        storyboards[topic.name] = storyboard_obj
-
-    print(f"Generated {len(storyboards)} storyboards")
-
     # Animation
-    print("\n=== Setting up Animation Client ===")
+    logger.info("\n=== Setting up Animation Client ===")
     langchain_client = ChatGoogleGenerativeAI(
         model=MODEL_NAME,
         temperature=1.0,
@@ -82,47 +104,196 @@ def main(pdf_path: str):
     )
     langchain_client.client = gemini_client
 
+    # Render quality: "low" (480p15) for fast iteration, "high"/"production" for final videos
+    render_quality = os.environ.get('MANIFLOW_RENDER_QUALITY', 'low')
+    # Renderer: "cairo" (CPU) or "opengl" (GPU, falls back to Cairo without a GL context)
+    renderer = os.environ.get('MANIFLOW_RENDERER', 'cairo')
+    # Set to 1 to give the agent an inline index of the Manim reference docs
+    docs_index = os.environ.get('MANIFLOW_DOCS_INDEX', '0') == '1'
+
     maniflow_animation_client = ManiflowAnimationClient(
         langchain_client, 
-        agent_workspace_path='./agent_workspace/'
+        agent_workspace_path='./agent_workspace/',
+        render_quality=render_quality,
+        renderer=renderer,
+        docs_index=docs_index
     )
 
+    # Check manim and LaTeX while the breakdown and storyboards run
+    threading.Thread(target=maniflow_animation_client.warm_up, daemon=True).start()
+
+    # Breakdown
+    logger.info("\n=== Starting Breakdown ===")
+    maniflow_breakdown_client = ManiflowBreakdownClient(gemini_client)
+
+    try:
+        # Cached results are keyed by model, thinking level and prompt text, so
+        # editing a prompt regenerates them; --no-cache refreshes them
+        pdf_cache_dir = CACHE_DIR / cache.file_hash(pdf_file)
+        breakdown_key = f"breakdown_{cache.cache_key(MODEL_NAME, 'high', BREAKDOWN_PROMPT)}"
+
+        breakdown_obj = cache.get_or_compute(
+            breakdown_key,
+            Breakdown,
+            lambda: maniflow_breakdown_client.breakdown(
+                file_path=pdf_file,
+                model=MODEL_NAME,
+                thinking_level="high"
+            )[0],
+            pdf_cache_dir,
+            refresh=not use_cache,
+        )
+        if breakdown_obj is None:
+            logger.info("Breakdown failed: the response could not be parsed")
+            return
+
+        logger.info("Breakdown completed successfully!")
+
+        # Generate storyboards
+        logger.info("\n=== Generating Storyboards ===")
+        storyboards = {}
+
+        topics = breakdown_obj.topics
+        storyboard_keys = {
+            topic.name: f"storyboard_{cache.cache_key(MODEL_NAME, 'high', STORYBOARD_PROMPT, topic.model_dump_json())}"
+            for topic in topics
+        }
+        pending_topics = []
+        for topic in topics:
+            storyboard_obj = cache.load(storyboard_keys[topic.name], TopicStoryboard, pdf_cache_dir) if use_cache else None
+            if storyboard_obj is not None:
+                storyboards[topic.name] = storyboard_obj
+            else:
+                pending_topics.append(topic)
+
+        # Upload the PDF once for every storyboard request
+        pdf_handle = maniflow_breakdown_client.upload(pdf_file) if pending_topics else None
+
+        # Storyboards don't depend on each other, so request several at once;
+        # storyboard() has no rate-limit backoff, so keep the burst small
+        with ThreadPoolExecutor(max_workers=max(1, min(len(pending_topics), 4))) as executor:
+            futures = {
+                executor.submit(
+                    maniflow_breakdown_client.storyboard,
+                    topic=topic,
+                    model=MODEL_NAME,
+                    thinking_level="high",
+                    source_file=pdf_handle
+                ): topic
+                for topic in pending_topics
+            }
+            # Completions arrive in bursts, so weight recent ones less for a steadier ETA
+            with tqdm(
+                total=len(topics),
+                initial=len(storyboards),
+                desc="Creating storyboards",
+                smoothing=0.1,
+                mininterval=0.5,
+            ) as pbar:
+                for future in as_completed(futures):
+                    topic = futures[future]
+                    try:
+                        storyboard_obj, raw_storyboard_response = future.result()
+                    except Exception as e:
+                        # Keep (and cache) the other storyboards; a re-run retries this one
+                        logger.info(f"Storyboard failed for topic {topic.name}: {type(e).__name__}: {e}")
+                        storyboard_obj = None
+                    if storyboard_obj is not None:
+                        cache.save(storyboard_keys[topic.name], storyboard_obj, pdf_cache_dir)
+                    storyboards[topic.name] = storyboard_obj
+                    pbar.set_postfix_str(topic.name[:40], refresh=False)
+                    pbar.update(1)
+    finally:
+        # Uploaded PDFs would otherwise linger in the File API for 48 hours
+        maniflow_breakdown_client.delete_uploads()
+
+    logger.info(f"Generated {len(storyboards)} storyboards")
+
     # Progress callback
     def progress_callback(topic_idx, iteration, message):
-        print(f"[Topic {topic_idx}, Iteration {iteration}] {message}")
+        logger.info(f"[Topic {topic_idx}, Iteration {iteration}] {message}")
+
+    # Finished animations are keyed by everything the agent sees, so a re-run
+    # only redoes topics whose prompt or render settings changed
+    format_prompt = make_storyboard_formatter(breakdown_obj)
+
+    def animation_key(topic_idx):
+        topic_prompt = format_prompt(storyboards[breakdown_obj.topics[topic_idx].name], topic_idx)
+        return "animation_" + cache.cache_key(
+            MODEL_NAME, MANIM_CODING_AGENT_PROMPT, str(docs_index), render_quality, renderer, topic_prompt
+        )
+
+    # Report each video as soon as it is in rendered_videos/, and keep a copy
+    # outside rendered_videos/ for later runs
+    def result_callback(result):
+        if result.success:
+            logger.info(f"Topic {result.topic_index} ready: {result.video_path}")
+            key = animation_key(result.topic_index)
+            cache.save_file(key, result.video_path, pdf_cache_dir, ".mp4")
+            cache.save(key, result, pdf_cache_dir)
+        else:
+            logger.info(f"Topic {result.topic_index} failed after {result.iterations} iterations")
 
     # Generate animations for all topics
-    print("\n=== Generating Animations ===")
+    logger.info("\n=== Generating Animations ===")
     all_animation_results = {}
 
+    topic_indices = []
     for i, topic in enumerate(breakdown_obj.topics):
-        topic_name = topic.name
-        
-        if topic_name in storyboards:
-            print(f"\n--- Starting Animation for Topic {i}: {topic_name} ---")
-            
-            results = maniflow_animation_client.animate_single(
-                breakdown=breakdown_obj,
-                storyboard=storyboards[topic_name],
-                topic_index=i,
-                max_iterations=5,
-                on_progress=progress_callback,
-                ratelimit=0
-            )
-            
-            all_animation_results[topic_name] = results
+        if storyboards.get(topic.name) is None:
+            logger.info(f"Warning: No storyboard found for topic: {topic.name}")
+            continue
+
+        key = animation_key(i)
+        cached_result = cache.load(key, AnimationResult, pdf_cache_dir) if use_cache else None
+        cached_video = cache.load_file(key, pdf_cache_dir, ".mp4")
+        if cached_result is not None and cached_result.success and cached_video is not None:
+            # Put the video back where the backend looks for it. The stored
+            # path is from an earlier run, whose workspace may have moved
+            video_path = maniflow_animation_client.rendered_videos_path / cached_result.video_path.name
+            cache.link_or_copy(cached_video, video_path)
+            cached_result.video_path = video_path
+            all_animation_results[topic.name] = cached_result
+            logger.info(f"Topic {i} loaded from cache: {cached_result.video_path}")
         else:
-            print(f"Warning: No storyboard found for topic: {topic_name}")
+            topic_indices.append(i)
+
+    # Topics animate side by side in their own workspaces; manim renders are
+    # capped at the CPU count by the client, so this mostly bounds LLM load
+    max_workers = int(os.environ.get('MANIFLOW_MAX_WORKERS', '4'))
 
-    print("\n=== Processing Complete ===")
-    print(f"Generated animations for {len(all_animation_results)} topics")
+    results = maniflow_animation_client.animate(
+        breakdown=breakdown_obj,
+        storyboards=[storyboards.get(topic.name) for topic in breakdown_obj.topics],
+        topic_indices=topic_indices,
+        max_iterations=5,
+        on_progress=progress_callback,
+        ratelimit=0,
+        max_workers=max_workers,
+        on_result=result_callback
+    )
+
+    for result in results:
+        all_animation_results[result.topic_name] = result
+
+    logger.info("\n=== Processing Complete ===")
+    logger.info(f"Generated animations for {len(all_animation_results)} topics")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python process_pdf.py <path_to_pdf>")
-        sys.exit(1)
-    
-    pdf_path = sys.argv[1]
-    main(pdf_path)
+    parser = argparse.ArgumentParser(description="Convert a PDF to animated educational videos")
+    parser.add_argument("pdf_path", help="Path to the PDF to process")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate the breakdown, storyboards and animations instead of loading cached ones",
+    )
+    args = parser.parse_args()
+
+    log_listener = start_log_listener()
+    try:
+        main(args.pdf_path, use_cache=not args.no_cache)
+    finally:
+        # Flush queued lines before exiting
+        log_listener.stop()
 
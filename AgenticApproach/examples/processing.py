@@ -2,6 +2,7 @@
 Maniflow Processing Script - Convert PDF to animated educational videos
 """
 
+import importlib.util
 import os
 import pathlib
 
@@ -10,9 +11,13 @@ from dotenv import load_dotenv
 from google import genai
 from google.genai import types as gemini_types
 from langchain_google_genai import ChatGoogleGenerativeAI
-from tqdm import tqdm
 
-from maniflow import ManiflowAnimationClient, ManiflowBreakdownClient
+from maniflow import Breakdown, ManiflowAnimationClient, ManiflowBreakdownClient, TopicStoryboard, cache
+from maniflow.prompts import BREAKDOWN_PROMPT, STORYBOARD_PROMPT
+
+# Breakdown and storyboard JSON from earlier runs: one folder per PDF, keyed
+# by model and prompt (the same layout process_pdf.py uses)
+CACHE_DIR = pathlib.Path("./.maniflow_cache")
 
 
 def main():
@@ -22,19 +27,39 @@ def main():
 
     aistudio_gemini_api_key = os.environ['GOOGLE_API_KEY']
     print(f"API Key: {aistudio_gemini_api_key[:3]}...{aistudio_gemini_api_key[-1:]}")
-    gemini_client = genai.Client(api_key=aistudio_gemini_api_key)
+    # Concurrent storyboard and agent requests share one pooled client instead
+    # of each paying for its own TLS handshake; HTTP/2 (when h2 is installed)
+    # multiplexes them over one connection
+    http_client = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
+    gemini_client = genai.Client(
+        api_key=aistudio_gemini_api_key,
+        http_options=gemini_types.HttpOptions(httpx_client=http_client),
+    )
 
     MODEL_NAME = "gemini-3-pro-preview"
+    pdf_file = pathlib.Path("./rlmpaper.pdf")
+    pdf_cache_dir = CACHE_DIR / cache.file_hash(pdf_file)
 
     # Breakdown
     print("\n=== Starting Breakdown ===")
     maniflow_breakdown_client = ManiflowBreakdownClient(gemini_client)
 
-    breakdown_obj, raw_breakdown_response = maniflow_breakdown_client.breakdown(
-        file_path=pathlib.Path("./rlmpaper.pdf"),
-        model=MODEL_NAME,
-        thinking_level="high"
+    breakdown_obj = cache.get_or_compute(
+        f"breakdown_{cache.cache_key(MODEL_NAME, 'high', BREAKDOWN_PROMPT)}",
+        Breakdown,
+        lambda: maniflow_breakdown_client.breakdown(
+            file_path=pdf_file,
+            model=MODEL_NAME,
+            thinking_level="high"
+        )[0],
+        pdf_cache_dir,
     )
+    if breakdown_obj is None:
+        print("Breakdown failed: the response could not be parsed")
+        return
 
     print("Breakdown completed successfully!")
 
@@ -42,14 +67,30 @@ def main():
     print("\n=== Generating Storyboards ===")
     storyboards = {}
 
-    for i, topic in tqdm(enumerate(breakdown_obj.topics), desc="Creating storyboards"):
-        storyboard_obj, raw_storyboard_response = maniflow_breakdown_client.storyboard(
-            topic=topic,
+    storyboard_keys = {
+        topic.name: f"storyboard_{cache.cache_key(MODEL_NAME, 'high', STORYBOARD_PROMPT, topic.model_dump_json())}"
+        for topic in breakdown_obj.topics
+    }
+    missing_topics = []
+    for topic in breakdown_obj.topics:
+        storyboard_obj = cache.load(storyboard_keys[topic.name], TopicStoryboard, pdf_cache_dir)
+        if storyboard_obj is not None:
+            storyboards[topic.name] = storyboard_obj
+        else:
+            missing_topics.append(topic)
+
+    if missing_topics:
+        # Several topics per request instead of one round-trip per topic
+        storyboard_objs, raw_storyboard_responses = maniflow_breakdown_client.storyboard_batch(
+            topics=missing_topics,
             model=MODEL_NAME,
             thinking_level="high",
-            source_file="./rlmpaper.pdf"
+            source_file=str(pdf_file)
         )
-        storyboards[topic.name] = storyboard_obj
+        for topic, storyboard_obj in zip(missing_topics, storyboard_objs):
+            if storyboard_obj is not None:
+                cache.save(storyboard_keys[topic.name], storyboard_obj, pdf_cache_dir)
+            storyboards[topic.name] = storyboard_obj
 
     print(f"Generated {len(storyboards)} storyboards")
 
@@ -2,8 +2,16 @@
 Maniflow - Educational video generation from documents
 """
 
+from maniflow import cache
 from maniflow.client import ManiflowAnimationClient, ManiflowBreakdownClient, ManiflowClient
-from maniflow.models import AnimationResult, AtomicTopic, Breakdown, Scene, TopicStoryboard
+from maniflow.models import (
+    AnimationResult,
+    AtomicTopic,
+    Breakdown,
+    Scene,
+    StoryboardBatch,
+    TopicStoryboard,
+)
 
 __version__ = "0.1.0"
 
@@ -15,6 +23,8 @@ __all__ = [
     "ManiflowBreakdownClient",
     "ManiflowClient",  # Backwards compatibility alias for ManiflowBreakdownClient
     "Scene",
+    "StoryboardBatch",
     "TopicStoryboard",
+    "cache",
 ]
 
@@ -0,0 +1,119 @@
+"""Filesystem cache for breakdowns, storyboards and rendered animations."""
+
+import hashlib
+import os
+import pathlib
+import shutil
+import threading
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def file_hash(file_path: str | pathlib.Path) -> str:
+    """Return a short sha256 hex digest of a file's contents."""
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()[:16]
+
+
+def cache_key(*parts: str) -> str:
+    """Build a cache key from its parts.
+
+    Parts can be anything that changes the result (file hash, model, thinking
+    level, prompt text); they are hashed so long prompts give short keys.
+    """
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:32]
+
+
+def load(key: str, model_type: type[ModelT], cache_dir: str | pathlib.Path) -> ModelT | None:
+    """Load a cached model, or None if it is missing or no longer validates."""
+    cache_file = pathlib.Path(cache_dir) / f"{key}.json"
+    try:
+        return model_type.model_validate_json(cache_file.read_text())
+    except (FileNotFoundError, ValidationError):
+        return None
+
+
+def save(key: str, value: BaseModel, cache_dir: str | pathlib.Path):
+    """Write a model to the cache atomically."""
+    cache_dir = pathlib.Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write next to the target and rename, so readers never see a partial file
+    tmp_file = cache_dir / f"{key}.{os.getpid()}.tmp"
+    tmp_file.write_text(value.model_dump_json())
+    os.replace(tmp_file, cache_dir / f"{key}.json")
+
+
+def get_or_compute(
+    key: str,
+    model_type: type[ModelT],
+    compute_fn: Callable[[], ModelT | None],
+    cache_dir: str | pathlib.Path,
+    refresh: bool = False,
+) -> ModelT | None:
+    """Return the cached model for key, computing and storing it on a miss.
+
+    Args:
+        key: Cache key, usually from cache_key().
+        model_type: Pydantic model class used to load the cached JSON.
+        compute_fn: Called with no arguments on a cache miss. May return None
+            (e.g. a response that failed to parse), which is not cached.
+        cache_dir: Folder holding the cached JSON files.
+        refresh: Ignore any cached value and recompute (the result is still stored).
+
+    Returns:
+        The cached or freshly computed model, or None if compute_fn failed.
+    """
+    cached = load(key, model_type, cache_dir) if not refresh else None
+    if cached is not None:
+        return cached
+
+    value = compute_fn()
+    if value is not None:
+        save(key, value, cache_dir)
+    return value
+
+
+def link_or_copy(src: str | pathlib.Path, dst: str | pathlib.Path):
+    """Hard-link src to dst, copying instead across filesystems. Replaces dst."""
+    dst = pathlib.Path(dst)
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def link_if_missing(src: str | pathlib.Path, dst: str | pathlib.Path):
+    """Hard-link src to dst unless dst already exists.
+
+    Across filesystems src is copied to a temporary file and renamed, so dst
+    never appears partially written.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        pass
+    except OSError:
+        dst = pathlib.Path(dst)
+        tmp_file = dst.with_name(f"{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(src, tmp_file)
+        os.replace(tmp_file, dst)
+
+
+def save_file(key: str, src: str | pathlib.Path, cache_dir: str | pathlib.Path, suffix: str) -> pathlib.Path:
+    """Store a file (e.g. a rendered video) in the cache under key."""
+    cache_dir = pathlib.Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_file = cache_dir / f"{key}{suffix}"
+    link_or_copy(src, cache_file)
+    return cache_file
+
+
+def load_file(key: str, cache_dir: str | pathlib.Path, suffix: str) -> pathlib.Path | None:
+    """Return the cached file stored under key, or None if there is none."""
+    cache_file = pathlib.Path(cache_dir) / f"{key}{suffix}"
+    return cache_file if cache_file.exists() else None
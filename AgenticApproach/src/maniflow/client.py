@@ -1,24 +1,90 @@
 """Maniflow clients for document processing and animation generation."""
 
-import copy
+import asyncio
+import hashlib
 import os
 import pathlib
+import random
+import re
+import shutil
 import subprocess
+import sys
+import tempfile
+import threading
 import time
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 
 from google import genai
 from google.genai import types as gemini_types
 from langchain_core.language_models import BaseChatModel
 
-from maniflow.models import AnimationResult, AtomicTopic, Breakdown, TopicStoryboard
+from maniflow.cache import link_if_missing, link_or_copy
+from maniflow.docs_index import build_manim_index
+from maniflow.models import AnimationResult, AtomicTopic, Breakdown, StoryboardBatch, TopicStoryboard
 from maniflow.prompts import (
     BREAKDOWN_PROMPT,
     MANIM_CODING_AGENT_PROMPT,
     SCENE_BOILERPLATE,
     STORYBOARD_PROMPT,
     format_storyboard_prompt,
+    format_topic_batch_input,
     format_topic_input,
+    make_storyboard_formatter,
+)
+
+# Manim quality presets: CLI flag and the resolution folder the video lands in
+_RENDER_QUALITIES = {
+    "low": ("-ql", "480p15"),
+    "medium": ("-qm", "720p30"),
+    "high": ("-qh", "1080p60"),
+    "production": ("-qp", "1440p60"),
+    "fourk": ("-qk", "2160p60"),
+}
+
+_RENDERERS = ("cairo", "opengl")
+
+# media/ folders (manim's default tex_dir and text_dir) whose svgs are shared
+_MANIM_SVG_DIRS = ("Tex", "texts")
+
+# Patterns for cleaning up manim's rich tracebacks
+_ANSI_ESCAPE_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+# Frame locations like `/tmp/topic_x/scene.py:339`; group 1 is the folder
+_SCENE_LINE_RE = re.compile(r'([^\s│]*)scene\.py:(\d+)')
+# manim's own scene.py (Scene.render calling construct) is not the user's file
+_MANIM_SCENE_DIR_RE = re.compile(r'manim[/\\]scene[/\\]$')
+_TRACEBACK_CODE_RE = re.compile(r'^[│\s]*❱?\s*(\d+)\s+│(.*)$')
+# Start of a Rich traceback frame, e.g. `│ /path/to/file.py:260 in render`
+_FRAME_HEADER_RE = re.compile(r'\.py:\d+ in ')
+# How much of the traceback is sent back to the agent on a failed render
+_TRACEBACK_TAIL_LINES = 40
+# Longest scene.py frame excerpt kept in addition to the tail
+_SCENE_FRAME_MAX_LINES = 20
+# Lines of scene.py shown on each side of the failing line in a fix prompt
+_FIX_CONTEXT_LINES = 40
+
+# Failed renders with less stderr than this are retried without the agent's
+# earlier conversation, which is mostly documentation it already read
+_LIGHT_FIX_STDERR_LIMIT = 8192
+
+# Backoff for agent calls rejected with HTTP 429 / RESOURCE_EXHAUSTED
+_RATE_LIMIT_RETRIES = 8
+_RATE_LIMIT_MAX_DELAY = 60.0
+
+# stderr fragments that mean the OpenGL renderer could not get a GL context.
+# Only context-creation failures: "OpenGL"/"moderngl" alone appear in every
+# OpenGL-renderer traceback (OpenGLVMobject, opengl_mobject.py, ...)
+_OPENGL_CONTEXT_ERRORS = (
+    "create_context",  # moderngl.create_context() / create_standalone_context()
+    "cannot create context",
+    "cannot open display",  # glcontext's XOpenDisplay failure
+    "NoSuchDisplayException",  # pyglet window without a display
+    "glXChooseFBConfig",
+    "glXCreateContext",
+    "eglGetDisplay",
+    "eglInitialize",
+    "eglCreateContext",
 )
 
 
@@ -33,26 +99,93 @@ class ManiflowBreakdownClient:
         """
         self.gemini_client = gemini_client
 
+        # Uploaded files keyed by content hash, so the same PDF is uploaded once
+        self._file_cache: dict[str, gemini_types.File] = {}
+        self._file_cache_lock = threading.Lock()
+
+    def _upload_cached(self, file_path: pathlib.Path) -> gemini_types.File:
+        """Upload a file, reusing an earlier upload of the same content.
+
+        Uploads that expire within the next few minutes are replaced.
+
+        Args:
+            file_path: Path to the file to upload.
+
+        Returns:
+            The uploaded Gemini file handle.
+        """
+        with file_path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+
+        with self._file_cache_lock:
+            cached = self._file_cache.get(digest)
+            if cached is not None and (
+                cached.expiration_time is None
+                or cached.expiration_time > datetime.now(timezone.utc) + timedelta(minutes=5)
+            ):
+                return cached
+
+            uploaded_file = self.gemini_client.files.upload(file=file_path)
+
+            # Large files are processed asynchronously before they can be used
+            while uploaded_file.state == gemini_types.FileState.PROCESSING:
+                time.sleep(1)
+                uploaded_file = self.gemini_client.files.get(name=uploaded_file.name)
+
+            self._file_cache[digest] = uploaded_file
+            return uploaded_file
+
+    def _resolve_file(self, file: str | pathlib.Path | gemini_types.File) -> gemini_types.File:
+        """Return an uploaded file handle, uploading a local path if needed."""
+        if isinstance(file, gemini_types.File):
+            return file
+        return self._upload_cached(pathlib.Path(file))
+
+    def upload(self, file_path: str | pathlib.Path) -> gemini_types.File:
+        """Upload a file once and return its handle.
+
+        The handle can be passed to breakdown(), storyboard() and
+        storyboard_batch() in place of a path, which skips re-hashing the file
+        on every call.
+
+        Args:
+            file_path: Path to the file to upload.
+
+        Returns:
+            The uploaded Gemini file handle, ready to use.
+        """
+        return self._upload_cached(pathlib.Path(file_path))
+
+    def delete_uploads(self):
+        """Delete every file this client has uploaded from the Gemini File API."""
+        with self._file_cache_lock:
+            uploaded_files = list(self._file_cache.values())
+            self._file_cache.clear()
+
+        for uploaded_file in uploaded_files:
+            try:
+                self.gemini_client.files.delete(name=uploaded_file.name)
+            except Exception as e:
+                print(f"Error deleting uploaded file {uploaded_file.name}: {e}")
+
     def breakdown(
         self,
-        file_path: str | pathlib.Path,
+        file_path: str | pathlib.Path | gemini_types.File,
         model: str = "gemini-3-flash-preview",
         thinking_level: str = "high",
     ) -> tuple[Breakdown, gemini_types.GenerateContentResponse]:
         """Break down a PDF document into atomic, self-contained topics.
 
         Args:
-            file_path: Path to the PDF file to analyze.
+            file_path: Path to the PDF file to analyze, or its handle from upload().
             model: Gemini model to use for the breakdown.
             thinking_level: Thinking level to use for the breakdown.
 
         Returns:
             A tuple of (Breakdown object, raw Gemini response).
         """
-        file_path = pathlib.Path(file_path)
-
-        # Upload the PDF using the File API
-        uploaded_file = self.gemini_client.files.upload(file=file_path)
+        # Upload the PDF using the File API (reused across calls for the same content)
+        uploaded_file = self._resolve_file(file_path)
 
         # Generate content with structured output
         response = self.gemini_client.models.generate_content(
@@ -80,7 +213,7 @@ class ManiflowBreakdownClient:
     def storyboard(
         self,
         topic: AtomicTopic,
-        source_file: str | pathlib.Path | None = None,
+        source_file: str | pathlib.Path | gemini_types.File | None = None,
         model: str = "gemini-3-flash-preview",
         thinking_level: str = "high",
     ) -> tuple[TopicStoryboard, gemini_types.GenerateContentResponse]:
@@ -88,7 +221,8 @@ class ManiflowBreakdownClient:
 
         Args:
             topic: The AtomicTopic to transform into a storyboard.
-            source_file: Optional path to the source PDF for additional context.
+            source_file: Optional path to the source PDF (or its handle from
+                upload()) for additional context.
             model: Gemini model to use for storyboard generation.
             thinking_level: Thinking level to use for generation.
 
@@ -101,9 +235,7 @@ class ManiflowBreakdownClient:
         # Prepare contents - optionally include source file
         contents: list = []
         if source_file is not None:
-            source_file = pathlib.Path(source_file)
-            uploaded_file = self.gemini_client.files.upload(file=source_file)
-            contents.append(uploaded_file)
+            contents.append(self._resolve_file(source_file))
         contents.append(final_prompt)
 
         # Generate content with structured output
@@ -132,6 +264,86 @@ class ManiflowBreakdownClient:
 
         return storyboard, response
 
+    def storyboard_batch(
+        self,
+        topics: list[AtomicTopic],
+        source_file: str | pathlib.Path | gemini_types.File | None = None,
+        model: str = "gemini-3-flash-preview",
+        thinking_level: str = "high",
+        batch_size: int = 4,
+    ) -> tuple[list[TopicStoryboard | None], list[gemini_types.GenerateContentResponse]]:
+        """Create storyboards for several topics with as few requests as possible.
+
+        Topics are sent batch_size at a time in one request each. A batch whose
+        response cannot be parsed (or has the wrong number of storyboards) is
+        retried topic by topic with storyboard().
+
+        Args:
+            topics: The AtomicTopics to transform into storyboards.
+            source_file: Optional path to the source PDF (or its handle from
+                upload()) for additional context.
+            model: Gemini model to use for storyboard generation.
+            thinking_level: Thinking level to use for generation.
+            batch_size: Maximum number of topics per request. Keeps each
+                response within the model's output limit.
+
+        Returns:
+            A tuple of (storyboards aligned with topics, raw Gemini responses).
+            A storyboard is None if it could not be generated.
+        """
+        storyboards: list[TopicStoryboard | None] = []
+        responses: list[gemini_types.GenerateContentResponse] = []
+
+        # Upload once for all batches
+        uploaded_file = self._resolve_file(source_file) if source_file is not None else None
+
+        for start in range(0, len(topics), batch_size):
+            batch = topics[start:start + batch_size]
+
+            contents: list = []
+            if uploaded_file is not None:
+                contents.append(uploaded_file)
+            contents.append(STORYBOARD_PROMPT + format_topic_batch_input(batch))
+
+            response = self.gemini_client.models.generate_content(
+                model=model,
+                config=gemini_types.GenerateContentConfig(
+                    tools=[
+                        gemini_types.GoogleSearch(),
+                        gemini_types.Tool(code_execution=gemini_types.ToolCodeExecution),
+                    ],
+                    response_mime_type="application/json",
+                    response_json_schema=StoryboardBatch.model_json_schema(),
+                    thinking_config=gemini_types.ThinkingConfig(thinking_level=thinking_level),
+                ),
+                contents=contents,
+            )
+            responses.append(response)
+
+            try:
+                batch_result = StoryboardBatch.model_validate_json(response.text)
+                if len(batch_result.storyboards) != len(batch):
+                    raise ValueError(
+                        f"expected {len(batch)} storyboards, got {len(batch_result.storyboards)}"
+                    )
+            except Exception as e:
+                print(f"Error parsing storyboard batch: {e}")
+                print("falling back to one request per topic")
+                for topic in batch:
+                    storyboard, single_response = self.storyboard(
+                        topic=topic,
+                        source_file=uploaded_file,
+                        model=model,
+                        thinking_level=thinking_level,
+                    )
+                    storyboards.append(storyboard)
+                    responses.append(single_response)
+                continue
+
+            storyboards.extend(batch_result.storyboards)
+
+        return storyboards, responses
+
 
 class ManiflowAnimationClient:
     """Client for generating Manim animations from storyboards.
@@ -163,6 +375,8 @@ class ManiflowAnimationClient:
         agent_workspace/
         ├── manim_docs/           # Manim documentation (tutorials/, guides/, reference/)
         ├── animation_workspace/  # Where scene.py is created and videos are rendered
+        │   └── topic_*/          # Temporary per-topic workspaces, removed when done
+        ├── manim_cache/          # Finished LaTeX/text svgs shared by all renders (auto-created)
         └── rendered_videos/      # Final output videos (auto-created)
     """
 
@@ -170,6 +384,11 @@ class ManiflowAnimationClient:
         self,
         langchain_model: BaseChatModel,
         agent_workspace_path: str | pathlib.Path,
+        render_quality: str = "low",
+        renderer: str = "cairo",
+        warm_up: bool = False,
+        max_renders: int | None = None,
+        docs_index: bool = False,
     ):
         """Initialize the animation client.
 
@@ -180,14 +399,35 @@ class ManiflowAnimationClient:
                 This folder should contain:
                 - manim_docs/: Manim documentation (tutorials/, guides/, reference/)
                 - animation_workspace/: Where scene files are created and rendered
+            render_quality: Manim quality preset used for rendering: "low"
+                (480p15, fast iteration), "medium", "high", "production" or "fourk".
+            renderer: Manim renderer, "cairo" (CPU) or "opengl" (GPU). OpenGL
+                renders fall back to Cairo when no GL context is available.
+            warm_up: Whether to call warm_up() (check manim and LaTeX) before returning.
+            max_renders: Maximum number of manim processes running at once,
+                across all topics. Defaults to the number of CPUs.
+            docs_index: Whether to append a one-line-per-class index of
+                manim_docs/reference/ to the agent's system prompt. Costs
+                about 7k prompt tokens per call but saves the agent most of
+                its glob/grep turns when looking up the API.
         """
+        if render_quality not in _RENDER_QUALITIES:
+            raise ValueError(
+                f"render_quality must be one of {list(_RENDER_QUALITIES)}, got: {render_quality}"
+            )
+        if renderer not in _RENDERERS:
+            raise ValueError(f"renderer must be one of {list(_RENDERERS)}, got: {renderer}")
+
         self.langchain_model = langchain_model
+        self.render_quality = render_quality
+        self.renderer = renderer
         self.agent_workspace_path = pathlib.Path(agent_workspace_path).resolve()
 
         # Derived paths within the agent workspace
         self.manim_docs_path = self.agent_workspace_path / "manim_docs"
         self.animation_workspace_path = self.agent_workspace_path / "animation_workspace"
         self.rendered_videos_path = self.agent_workspace_path / "rendered_videos"
+        self.manim_cache_path = self.agent_workspace_path / "manim_cache"
 
         # Validate paths
         if not self.agent_workspace_path.exists():
@@ -198,75 +438,302 @@ class ManiflowAnimationClient:
             self.animation_workspace_path.mkdir(parents=True, exist_ok=True)
         if not self.rendered_videos_path.exists():
             self.rendered_videos_path.mkdir(parents=True, exist_ok=True)
+        self.manim_cache_path.mkdir(parents=True, exist_ok=True)
+
+        # Built once so every agent call sends the same, cacheable prefix
+        self._system_prompt = MANIM_CODING_AGENT_PROMPT
+        if docs_index:
+            self._system_prompt += build_manim_index(self.manim_docs_path)
+
+        # Shared across threads so concurrent topics respect the same ratelimit
+        self._ratelimit_lock = threading.Lock()
+        self._last_invoke_time = 0.0
 
-    def _create_agent(self):
-        """Create a new coding agent instance."""
+        # Renders are CPU-bound and agent calls are network-bound, so topics
+        # queue for a render slot without holding up other topics' agent calls
+        self._render_slots = threading.BoundedSemaphore(max_renders or os.cpu_count() or 1)
+
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self) -> bool:
+        """Check that manim and LaTeX are usable before the first topic renders.
+
+        Imports manim once in a subprocess, which writes its bytecode and pulls
+        the package into the OS file cache, and looks up `latex` on the PATH
+        renders use. A broken install is reported up front instead of after
+        the agent's first attempt. Compiles no TeX, so it is safe to run in a
+        background thread while topics render.
+
+        Returns:
+            True if manim imports and latex was found.
+        """
+        env = self._manim_env()
+        result = subprocess.run(
+            [sys.executable, "-c", "import manim"], capture_output=True, text=True, env=env
+        )
+        if result.returncode != 0:
+            print(f"manim failed to import:\n{result.stderr}")
+            return False
+        if shutil.which("latex", path=env["PATH"]) is None:
+            print("latex not found on PATH; Tex and MathTex will fail to render")
+            return False
+        return True
+
+    def _manim_env(self) -> dict[str, str]:
+        """Environment for manim subprocesses."""
+        env = os.environ.copy()
+        # Add TeX to PATH for LaTeX rendering (macOS)
+        env["PATH"] = "/Library/TeX/texbin:" + os.environ.get("PATH", "")
+        return env
+
+    def _create_agent(self, workspace_dir: pathlib.Path):
+        """Create a new coding agent instance.
+
+        The agent always sees its scene file as ./animation_workspace/scene.py;
+        that path is routed to workspace_dir so topics can run side by side.
+        """
         from deepagents import create_deep_agent
-        from deepagents.backends import FilesystemBackend
+        from deepagents.backends import CompositeBackend, FilesystemBackend
 
         return create_deep_agent(
             model=self.langchain_model,
-            system_prompt=MANIM_CODING_AGENT_PROMPT,
-            backend=FilesystemBackend(root_dir=str(self.agent_workspace_path), virtual_mode=True),
+            system_prompt=self._system_prompt,
+            backend=CompositeBackend(
+                default=FilesystemBackend(root_dir=str(self.agent_workspace_path), virtual_mode=True),
+                routes={
+                    "/animation_workspace/": FilesystemBackend(root_dir=str(workspace_dir), virtual_mode=True),
+                },
+            ),
         )
 
-    def _prepare_workspace(self):
-        """Clear the workspace and write the boilerplate scene file."""
-        # Clear existing files in workspace (except keep the directory)
-        for item in self.animation_workspace_path.iterdir():
-            if item.is_file():
-                item.unlink()
-            elif item.is_dir():
-                import shutil
-                shutil.rmtree(item)
+    def _wait_for_ratelimit(self, ratelimit: int):
+        """Block until at least `ratelimit` seconds have passed since the last agent call."""
+        if ratelimit <= 0:
+            return
+        with self._ratelimit_lock:
+            wait = self._last_invoke_time + ratelimit - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_invoke_time = time.monotonic()
+
+    def _prepare_workspace(self, workspace_dir: pathlib.Path | None = None) -> pathlib.Path:
+        """Set up a workspace with the boilerplate scene file.
+
+        Args:
+            workspace_dir: Folder to clear and reuse. If None, a fresh
+                animation_workspace/topic_*/ folder is created instead.
+
+        Returns:
+            The prepared workspace folder.
+        """
+        if workspace_dir is None:
+            workspace_dir = pathlib.Path(tempfile.mkdtemp(prefix="topic_", dir=self.animation_workspace_path))
+        else:
+            workspace_dir.mkdir(parents=True, exist_ok=True)
+
+            # Clear existing files in workspace (except keep the directory)
+            for item in workspace_dir.iterdir():
+                if item.is_file():
+                    item.unlink()
+                elif item.is_dir():
+                    shutil.rmtree(item)
 
         # Write boilerplate scene file
-        scene_file = self.animation_workspace_path / "scene.py"
+        scene_file = workspace_dir / "scene.py"
         scene_file.write_text(SCENE_BOILERPLATE)
+        return workspace_dir
+
+    def _run_agent(
+        self,
+        agent,
+        messages: list,
+        workspace_dir: pathlib.Path,
+        topic_index: int,
+        iteration: int,
+        on_progress: Callable[[int, int, str], None] | None,
+    ) -> dict:
+        """Run the agent step by step, reporting each tool call as it happens.
 
-    def _render_scene(self) -> subprocess.CompletedProcess:
+        Rate-limited calls are retried with exponential backoff and jitter, so
+        callers only need the fixed ratelimit spacing when they want it. A
+        retry replays the conversation from the start, so scene.py is first
+        restored to what it was before the aborted attempt edited it.
+
+        Returns:
+            The final agent state, same as agent.invoke().
+        """
+        scene_file = workspace_dir / "scene.py"
+        scene_snapshot = self._read_scene(workspace_dir)
+
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            if attempt > 0:
+                if scene_snapshot is None:
+                    scene_file.unlink(missing_ok=True)
+                else:
+                    scene_file.write_text(scene_snapshot)
+            try:
+                state = None
+                for state in agent.stream({"messages": messages}, stream_mode="values"):
+                    if on_progress:
+                        last_message = state["messages"][-1]
+                        for tool_call in getattr(last_message, "tool_calls", None) or []:
+                            on_progress(topic_index, iteration, f"Agent called {tool_call['name']}")
+                return state
+            except Exception as e:
+                if attempt == _RATE_LIMIT_RETRIES or not self._is_rate_limited(e):
+                    raise
+                # Half fixed, half random, so concurrent topics don't retry in lockstep
+                delay = min(_RATE_LIMIT_MAX_DELAY, 2.0 ** attempt)
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                print(f"Topic {topic_index}: rate limited, retrying agent call in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _is_rate_limited(self, error: BaseException) -> bool:
+        """Whether an exception (or one it wraps) is a 429 from the model API."""
+        while error is not None:
+            if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+                return True
+            if "RESOURCE_EXHAUSTED" in str(error):
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    def _read_scene(self, workspace_dir: pathlib.Path) -> str | None:
+        """Return the contents of scene.py, or None if it does not exist."""
+        scene_file = workspace_dir / "scene.py"
+        return scene_file.read_text() if scene_file.exists() else None
+
+    def _check_syntax(self, scene_code: str) -> str | None:
+        """Compile scene.py's source without running it.
+
+        Returns:
+            A manim-style error message if the file has a syntax error, else None.
+        """
+        try:
+            compile(scene_code, "scene.py", "exec")
+        except SyntaxError as e:
+            code_line = (e.text or "").strip()
+            return f"File scene.py:{e.lineno}\n    {code_line}\n{type(e).__name__}: {e.msg}"
+        return None
+
+    def _render_scene(
+        self, workspace_dir: pathlib.Path, scene_code: str | None = None, dry_run: bool = False
+    ) -> subprocess.CompletedProcess:
         """Run manim to render the scene.
 
+        Syntax errors are caught before manim starts, so the retry loop gets
+        them without paying for a manim launch.
+
+        Args:
+            workspace_dir: Folder containing scene.py.
+            scene_code: Contents of scene.py if the caller already has them,
+                to avoid reading the file again.
+            dry_run: Run construct() without rasterizing frames or writing a
+                video. Catches runtime errors much faster than a full render.
+
         Returns:
             CompletedProcess with stdout/stderr from manim.
         """
-        my_env = os.environ.copy()
-        # Add TeX to PATH for LaTeX rendering (macOS)
-        my_env["PATH"] = "/Library/TeX/texbin:" + os.environ.get("PATH", "")
-
-        return subprocess.run(
-            ["uv", "run", "manim", "-ql", "scene.py"],
-            capture_output=True,
-            text=True,
-            cwd=str(self.animation_workspace_path),
-            env=my_env,
-        )
-
-    def _check_render_success(self) -> bool:
-        """Check if manim successfully rendered a video."""
-        # Check for both low quality and high quality folders
-        possible_dirs = [
-            self.animation_workspace_path / "media" / "videos" / "scene" / "480p15",  # -ql
-            self.animation_workspace_path / "media" / "videos" / "scene" / "1920p15"  # original
+        if scene_code is None:
+            scene_code = self._read_scene(workspace_dir) or ""
+        syntax_error = self._check_syntax(scene_code)
+        if syntax_error is not None:
+            return subprocess.CompletedProcess(args=["compile", "scene.py"], returncode=1, stdout="", stderr=syntax_error)
+
+        my_env = self._manim_env()
+
+        # Run manim with this interpreter directly: `uv run` would re-resolve
+        # the environment before every render and retry
+        command = [
+            sys.executable, "-m", "manim",
+            _RENDER_QUALITIES[self.render_quality][0],
+            "scene.py",
         ]
-        
-        for video_dir in possible_dirs:
-            if video_dir.exists() and len(list(video_dir.glob("*.mp4"))) > 0:
-                return True
-        return False
+        if dry_run:
+            command.insert(-1, "--dry_run")
+
+        # A dry run draws nothing, so it never needs the GL context
+        if self.renderer == "opengl" and not dry_run:
+            opengl_command = command[:-1] + ["--renderer=opengl", "--write_to_movie", "scene.py"]
+            # Headless Linux hosts need a virtual display for the GL context
+            if not my_env.get("DISPLAY") and shutil.which("xvfb-run"):
+                opengl_command = ["xvfb-run", "-a"] + opengl_command
+
+            result = self._run_manim(opengl_command, workspace_dir, my_env)
+            if result.returncode == 0 or not any(err in result.stderr for err in _OPENGL_CONTEXT_ERRORS):
+                return result
+            print("OpenGL renderer unavailable, falling back to Cairo")
+
+        return self._run_manim(command, workspace_dir, my_env)
+
+    def _run_manim(
+        self, command: list[str], workspace_dir: pathlib.Path, env: dict[str, str]
+    ) -> subprocess.CompletedProcess:
+        """Run a manim command once a render slot is free."""
+        with self._render_slots:
+            self._seed_manim_cache(workspace_dir)
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                cwd=str(workspace_dir),
+                env=env,
+            )
+        if result.returncode == 0:
+            self._publish_manim_cache(workspace_dir)
+        return result
+
+    def _seed_manim_cache(self, workspace_dir: pathlib.Path):
+        """Link the shared cache's finished svgs into the workspace's media folders.
+
+        Every render compiles LaTeX and text in its own media/Tex and
+        media/texts, so concurrent renders never read each other's
+        half-written .dvi or .svg files. Manim skips any expression whose
+        .svg is already there, which is what makes the shared cache pay off.
+        """
+        for name in _MANIM_SVG_DIRS:
+            local_dir = workspace_dir / "media" / name
+            local_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                with os.scandir(self.manim_cache_path / name) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".svg"):
+                            link_if_missing(entry.path, local_dir / entry.name)
+            except FileNotFoundError:
+                continue
+
+    def _publish_manim_cache(self, workspace_dir: pathlib.Path):
+        """Add the svgs of a successful render to the shared cache."""
+        for name in _MANIM_SVG_DIRS:
+            shared_dir = self.manim_cache_path / name
+            shared_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                with os.scandir(workspace_dir / "media" / name) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".svg"):
+                            link_if_missing(entry.path, shared_dir / entry.name)
+            except FileNotFoundError:
+                continue
 
-    def _get_video_path(self) -> pathlib.Path | None:
-        """Get the path to the rendered video file."""
-        possible_dirs = [
-            self.animation_workspace_path / "media" / "videos" / "scene" / "480p15",  # -ql
-            self.animation_workspace_path / "media" / "videos" / "scene" / "1920p15"  # original
+    def _video_dirs(self, workspace_dir: pathlib.Path) -> list[pathlib.Path]:
+        """Folders manim may have written the rendered video to."""
+        scene_videos = workspace_dir / "media" / "videos" / "scene"
+        return [
+            scene_videos / _RENDER_QUALITIES[self.render_quality][1],  # configured quality
+            scene_videos / "1920p15",  # original
         ]
-        
-        for video_dir in possible_dirs:
-            if video_dir.exists():
-                video_files = list(video_dir.glob("*.mp4"))
-                if video_files:
-                    return video_files[0]
+
+    def _get_video_path(self, workspace_dir: pathlib.Path) -> pathlib.Path | None:
+        """Get the path to the rendered video file, or None if the render failed."""
+        for video_dir in self._video_dirs(workspace_dir):
+            try:
+                with os.scandir(video_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".mp4"):
+                            return pathlib.Path(entry.path)
+            except FileNotFoundError:
+                continue
         return None
 
     def _parse_and_clean_error(self, stderr: str) -> str:
@@ -283,39 +750,112 @@ class ManiflowAnimationClient:
         Returns:
             Clean, structured error message for the LLM
         """
-        import re
-        
-        # Strip ANSI color codes
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        clean_stderr = ansi_escape.sub('', stderr)
+        # Strip ANSI color codes (once; everything below works on the clean text)
+        clean_stderr = _ANSI_ESCAPE_RE.sub('', stderr) if '\x1b' in stderr else stderr
+        lines = clean_stderr.split('\n')
         
         # Extract the final error type and message (last line typically)
-        error_lines = [line for line in clean_stderr.split('\n') if line.strip()]
+        error_lines = [line for line in lines if line.strip()]
         final_error = error_lines[-1] if error_lines else "Unknown error"
         
         # Extract file, line number, and code snippet
         # Pattern: scene.py:339 in construct
-        file_pattern = re.compile(r'scene\.py:(\d+)')
-        line_match = file_pattern.search(clean_stderr)
+        frame = self._scene_error_frame(clean_stderr)
+        frame_lines: list[str] = []
+        frame_start = len(lines)
         
         result = f"ERROR: {final_error}\n\n"
         
-        if line_match:
-            line_num = line_match.group(1)
+        if frame is not None:
+            line_num = frame.group(2)
             result += f"LOCATION: scene.py, line {line_num}\n\n"
+
+            # The frame's block runs from its path line to the next frame
+            frame_start = clean_stderr.count('\n', 0, frame.start())
+            frame_end = frame_start + 1
+            while (
+                frame_end < len(lines)
+                and frame_end - frame_start < _SCENE_FRAME_MAX_LINES
+                and not _FRAME_HEADER_RE.search(lines[frame_end])
+            ):
+                frame_end += 1
+            frame_lines = lines[frame_start:frame_end]
             
-            # Try to extract the actual code at that line from the traceback
+            # Index the traceback's source excerpts by line number in one pass,
+            # preferring the scene.py frame over library frames
             # The traceback shows: ❱ 339 │   │   self.play(...)
-            code_pattern = re.compile(rf'❱?\s*{line_num}\s+.*?│\s+(.*?)(?:\n|$)')
-            code_match = code_pattern.search(stderr)
-            if code_match:
-                code_line = ansi_escape.sub('', code_match.group(1)).strip()
+            code_by_line: dict[str, str] = {}
+            for line in frame_lines + lines:
+                code_match = _TRACEBACK_CODE_RE.match(line)
+                if code_match:
+                    code_by_line.setdefault(code_match.group(1), code_match.group(2).strip("│ "))
+
+            code_line = code_by_line.get(line_num)
+            if code_line:
                 result += f"CODE AT LINE {line_num}:\n{code_line}\n\n"
         
-        result += f"FULL TRACEBACK:\n{clean_stderr}"
+        # The error and its cause are at the end; the head is mostly manim internals
+        if len(lines) > _TRACEBACK_TAIL_LINES:
+            # Errors raised deep inside manim push the scene.py frame out of the tail
+            if frame_start < len(lines) - _TRACEBACK_TAIL_LINES:
+                result += "SCENE.PY FRAME:\n" + "\n".join(frame_lines) + "\n\n"
+            result += f"TRACEBACK (last {_TRACEBACK_TAIL_LINES} lines):\n"
+            result += "\n".join(lines[-_TRACEBACK_TAIL_LINES:])
+        else:
+            result += f"FULL TRACEBACK:\n{clean_stderr}"
         
         return result
 
+    def _scene_error_frame(self, clean_stderr: str) -> re.Match | None:
+        """Find the traceback frame in the user's scene.py, if any.
+
+        Manim's own manim/scene/scene.py frames are skipped, and the innermost
+        (last) remaining frame wins: that is where the user's code called
+        into the library.
+
+        Returns:
+            A _SCENE_LINE_RE match whose group 2 is the line number, or None.
+        """
+        for match in reversed(list(_SCENE_LINE_RE.finditer(clean_stderr))):
+            if not _MANIM_SCENE_DIR_RE.search(match.group(1)):
+                return match
+        return None
+
+    def _export_video(self, video_path: pathlib.Path, output_file: pathlib.Path):
+        """Place a rendered video in rendered_videos/ without copying when possible.
+
+        A hard link is instant and makes the file appear complete in one step.
+        Across filesystems, shutil.copyfile uses the OS's fast copy path.
+        """
+        link_or_copy(video_path, output_file)
+
+    def _format_scene_context(self, scene_code: str, stderr: str) -> str:
+        """Show the agent the part of scene.py around the failing line.
+
+        Long files are cut to a numbered window around the line named in the
+        traceback; the agent can still read_file the rest. Short files, and
+        errors without a scene.py line, get the whole file.
+        """
+        lines = scene_code.splitlines()
+        frame = self._scene_error_frame(_ANSI_ESCAPE_RE.sub('', stderr))
+        error_line = int(frame.group(2)) if frame is not None else None
+        if (
+            error_line is None
+            or not 1 <= error_line <= len(lines)
+            or len(lines) <= 3 * _FIX_CONTEXT_LINES
+        ):
+            return f"Here is the current scene.py file:\n```python\n{scene_code}\n```"
+
+        start = max(1, error_line - _FIX_CONTEXT_LINES)
+        end = min(len(lines), error_line + _FIX_CONTEXT_LINES)
+        numbered = "\n".join(f"{n:>5}  {lines[n - 1]}" for n in range(start, end + 1))
+        return (
+            f"Here are lines {start}-{end} of the current scene.py file ({len(lines)} lines in total; "
+            "the line numbers are not part of the file):\n"
+            f"```python\n{numbered}\n```\n"
+            "Use `read_file ./animation_workspace/scene.py` if you need to see the rest of the file."
+        )
+
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize a string for use in a filename.
 
@@ -325,7 +865,6 @@ class ManiflowAnimationClient:
         Returns:
             A sanitized string safe for use in filenames.
         """
-        import re
         # Replace spaces with underscores
         sanitized = name.replace(" ", "_")
         # Remove any character that's not alphanumeric, underscore, or hyphen
@@ -334,6 +873,40 @@ class ManiflowAnimationClient:
         return sanitized[:50].lower()
     
 
+    def _missing_topic_result(
+        self,
+        breakdown: Breakdown,
+        storyboards: list[TopicStoryboard],
+        topic_idx: int,
+    ) -> AnimationResult | None:
+        """Return a failed AnimationResult if topic_idx has no storyboard or topic, else None."""
+        if topic_idx >= len(storyboards):
+            return AnimationResult(
+                topic_index=topic_idx,
+                topic_name=breakdown.topics[topic_idx].name if topic_idx < len(breakdown.topics) else "Unknown",
+                success=False,
+                error_message=f"No storyboard found for topic index {topic_idx}",
+            )
+
+        if topic_idx >= len(breakdown.topics):
+            return AnimationResult(
+                topic_index=topic_idx,
+                topic_name="Unknown",
+                success=False,
+                error_message=f"No topic found in breakdown for index {topic_idx}",
+            )
+
+        return None
+
+    def _error_topic_result(self, breakdown: Breakdown, topic_idx: int, error: BaseException) -> AnimationResult:
+        """Return a failed AnimationResult for a topic whose animation raised."""
+        return AnimationResult(
+            topic_index=topic_idx,
+            topic_name=breakdown.topics[topic_idx].name,
+            success=False,
+            error_message=f"{type(error).__name__}: {error}",
+        )
+
     def animate_single(
         self,
         breakdown: Breakdown,
@@ -342,35 +915,72 @@ class ManiflowAnimationClient:
         max_iterations: int = 5,
         on_progress: Callable[[int, int, str], None] | None = None,
         ratelimit: int = 0,
+        workspace_dir: str | pathlib.Path | None = None,
+        format_prompt: Callable[[TopicStoryboard, int], str] | None = None,
     ) -> AnimationResult:
-        """Generate a Manim animation for a single storyboard."""
-        import shutil
+        """Generate a Manim animation for a single storyboard.
+
+        Args:
+            workspace_dir: Folder to create and render scene.py in. If None, a
+                temporary animation_workspace/topic_*/ folder is used and removed
+                once the result is collected.
+            format_prompt: Prompt formatter from make_storyboard_formatter(breakdown),
+                so callers animating many topics build the shared parts once.
+                Defaults to format_storyboard_prompt.
+        """
+        owns_workspace = workspace_dir is None
+        workspace_dir = self._prepare_workspace(
+            pathlib.Path(workspace_dir) if workspace_dir is not None else None
+        )
+        try:
+            return self._animate_in_workspace(
+                breakdown, storyboard, topic_index, max_iterations, on_progress, ratelimit, workspace_dir,
+                format_prompt,
+            )
+        finally:
+            if owns_workspace:
+                shutil.rmtree(workspace_dir, ignore_errors=True)
 
+    def _animate_in_workspace(
+        self,
+        breakdown: Breakdown,
+        storyboard: TopicStoryboard,
+        topic_index: int,
+        max_iterations: int,
+        on_progress: Callable[[int, int, str], None] | None,
+        ratelimit: int,
+        workspace_dir: pathlib.Path,
+        format_prompt: Callable[[TopicStoryboard, int], str] | None,
+    ) -> AnimationResult:
+        """Run the agent and render loop for one topic in a prepared workspace."""
         topic_name = breakdown.topics[topic_index].name if topic_index < len(breakdown.topics) else "Unknown"
 
         if on_progress:
             on_progress(topic_index, 0, f"Starting animation for topic: {topic_name}")
 
-        # Prepare workspace
-        self._prepare_workspace()
-
         # Create agent
-        agent = self._create_agent()
+        agent = self._create_agent(workspace_dir)
 
         # Format prompt
-        prompt = format_storyboard_prompt(breakdown, storyboard, topic_index)
+        if format_prompt is not None:
+            prompt = format_prompt(storyboard, topic_index)
+        else:
+            prompt = format_storyboard_prompt(breakdown, storyboard, topic_index)
 
         # Run agent
         if on_progress:
             on_progress(topic_index, 0, "Running coding agent...")
 
-        if ratelimit > 0:
-            time.sleep(ratelimit)
-        result = agent.invoke({"messages": [{"role": "user", "content": prompt}]})
+        self._wait_for_ratelimit(ratelimit)
+        result = self._run_agent(
+            agent, [{"role": "user", "content": prompt}], workspace_dir, topic_index, 0, on_progress
+        )
 
         # Render
-        manim_result = self._render_scene()
-        success = self._check_render_success()
+        scene_code = self._read_scene(workspace_dir)
+        manim_result = self._render_scene(workspace_dir, scene_code)
+        video_path = self._get_video_path(workspace_dir)
+        success = video_path is not None
 
         iteration = 0
         while not success and iteration < max_iterations:
@@ -378,50 +988,52 @@ class ManiflowAnimationClient:
             if on_progress:
                 on_progress(topic_index, iteration, f"Render failed, retrying (iteration {iteration}/{max_iterations})...")
 
-            # Read the current scene.py file
-            scene_file = self.animation_workspace_path / "scene.py"
-            scene_code = scene_file.read_text() if scene_file.exists() else ""
-
             # Clean and structure the error
             cleaned_error = self._parse_and_clean_error(manim_result.stderr)
             
             # Create fix prompt with scene.py and error
+            scene_context = self._format_scene_context(scene_code or "", manim_result.stderr)
             fix_prompt = f"""The code failed to render with the following error:
 
     {cleaned_error}
 
-    Here is the current scene.py file:
-    ```python
-    {scene_code}
-    ```
+    {scene_context}
 
     Fix ONLY the error above. Do not optimize, refactor, or change any other part of the code. Keep everything else exactly the same. Only make the minimal change needed to fix this specific error."""
 
-            print(f"\n=== RENDER FAILED - Iteration {iteration}/{max_iterations} ===")
+            print(f"\n=== RENDER FAILED - Topic {topic_index}, Iteration {iteration}/{max_iterations} ===")
             print(f"Error message being passed to Gemini:\n{cleaned_error}")
             print("=" * 60 + "\n")
 
-            history = copy.deepcopy(result["messages"])
-            history.append({"role": "user", "content": fix_prompt})
+            if len(manim_result.stderr) < _LIGHT_FIX_STDERR_LIMIT:
+                # A short traceback means a local fix: start a fresh conversation
+                # instead of replaying the whole trajectory (docs reads included)
+                history = [{
+                    "role": "user",
+                    "content": f"You are fixing `./animation_workspace/scene.py`.\n\n{fix_prompt}",
+                }]
+            else:
+                # Messages are never mutated, so a shallow copy is enough
+                history = [*result["messages"], {"role": "user", "content": fix_prompt}]
 
-            result = agent.invoke({"messages": history})
-            if ratelimit > 0:
-                time.sleep(ratelimit)
-            manim_result = self._render_scene()
-            success = self._check_render_success()
+            self._wait_for_ratelimit(ratelimit)
+            result = self._run_agent(agent, history, workspace_dir, topic_index, iteration, on_progress)
 
-        # Collect result
-        scene_file = self.animation_workspace_path / "scene.py"
-        scene_code = scene_file.read_text() if scene_file.exists() else None
+            # Only pay for rasterizing frames once the fix actually runs
+            scene_code = self._read_scene(workspace_dir)
+            manim_result = self._render_scene(workspace_dir, scene_code, dry_run=True)
+            if manim_result.returncode == 0:
+                manim_result = self._render_scene(workspace_dir, scene_code)
+            video_path = self._get_video_path(workspace_dir)
+            success = video_path is not None
 
+        # Collect result
         if success:
-            video_path = self._get_video_path()
-
             # Copy to rendered_videos folder
             if video_path is not None:
                 sanitized_name = self._sanitize_filename(topic_name)
                 output_file = self.rendered_videos_path / f"{sanitized_name}_{topic_index}.mp4"
-                shutil.copy(video_path, output_file)
+                self._export_video(video_path, output_file)
                 video_path = output_file
 
             if on_progress:
@@ -456,9 +1068,17 @@ class ManiflowAnimationClient:
         max_iterations: int = 5,
         on_progress: Callable[[int, int, str], None] | None = None,
         ratelimit: int = 0,
+        max_workers: int = 4,
+        on_result: Callable[[AnimationResult], None] | None = None,
     ) -> list[AnimationResult]:
         """Generate Manim animations for storyboards.
 
+        Topics are animated concurrently, each in its own temporary
+        animation_workspace/topic_*/ folder, so one topic's LLM calls
+        overlap with another topic's manim render. max_workers may exceed the
+        CPU count: renders beyond the client's max_renders wait for a slot
+        while the remaining topics keep generating code.
+
         Args:
             breakdown: The document breakdown containing all topics.
             storyboards: List of storyboards (one per topic) to animate.
@@ -466,120 +1086,115 @@ class ManiflowAnimationClient:
                 If None, animates all topics that have storyboards.
             max_iterations: Maximum retry iterations for failed renders.
             on_progress: Optional callback(topic_index, iteration, status_message)
-                for progress updates.
-            ratelimit: Optional ratelimit in seconds to wait between iterations.
+                for progress updates. May be called from worker threads.
+            ratelimit: Optional minimum spacing in seconds between agent calls,
+                shared across all concurrently running topics.
+            max_workers: Maximum number of topics animated at the same time.
+                A topic that raises is reported as a failed AnimationResult
+                instead of discarding the others.
+            on_result: Optional callback(result) called on the calling thread
+                as soon as each topic finishes, in completion order, so its
+                video can be used before the remaining topics are done.
 
         Returns:
-            List of AnimationResult objects, one per topic attempted.
+            List of AnimationResult objects, one per topic attempted, in the
+            order of topic_indices.
             Videos are saved to rendered_videos/{topic_name}_{topic_index}.mp4
         """
-        import shutil
-
         # Determine which topics to animate
         if topic_indices is None:
             topic_indices = list(range(len(storyboards)))
 
-        results: list[AnimationResult] = []
-
-        for topic_idx in topic_indices:
-            if topic_idx >= len(storyboards):
-                results.append(AnimationResult(
+        results: dict[int, AnimationResult] = {}
+        futures: dict[Future, int] = {}
+        format_prompt = make_storyboard_formatter(breakdown)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for position, topic_idx in enumerate(topic_indices):
+                missing = self._missing_topic_result(breakdown, storyboards, topic_idx)
+                if missing is not None:
+                    results[position] = missing
+                    if on_result:
+                        on_result(missing)
+                    continue
+
+                future = executor.submit(
+                    self.animate_single,
+                    breakdown=breakdown,
+                    storyboard=storyboards[topic_idx],
                     topic_index=topic_idx,
-                    topic_name=breakdown.topics[topic_idx].name if topic_idx < len(breakdown.topics) else "Unknown",
-                    success=False,
-                    error_message=f"No storyboard found for topic index {topic_idx}",
-                ))
-                continue
-
-            if topic_idx >= len(breakdown.topics):
-                results.append(AnimationResult(
-                    topic_index=topic_idx,
-                    topic_name="Unknown",
-                    success=False,
-                    error_message=f"No topic found in breakdown for index {topic_idx}",
-                ))
-                continue
-
-            storyboard = storyboards[topic_idx]
-            topic_name = breakdown.topics[topic_idx].name
-
-            if on_progress:
-                on_progress(topic_idx, 0, f"Starting animation for topic: {topic_name}")
+                    max_iterations=max_iterations,
+                    on_progress=on_progress,
+                    ratelimit=ratelimit,
+                    format_prompt=format_prompt,
+                )
+                futures[future] = position
+
+            for future in as_completed(futures):
+                position = futures[future]
+                try:
+                    results[position] = future.result()
+                except Exception as e:
+                    # One topic's agent or filesystem error must not discard the others
+                    results[position] = self._error_topic_result(breakdown, topic_indices[position], e)
+                if on_result:
+                    on_result(results[position])
+
+        return [results[position] for position in range(len(topic_indices))]
+
+
+    async def aanimate(
+        self,
+        breakdown: Breakdown,
+        storyboards: list[TopicStoryboard],
+        topic_indices: list[int] | None = None,
+        max_iterations: int = 5,
+        on_progress: Callable[[int, int, str], None] | None = None,
+        ratelimit: int = 0,
+        max_concurrency: int = 4,
+    ) -> list[AnimationResult]:
+        """Async version of animate() for callers that already run an event loop.
 
-            # Prepare workspace
-            self._prepare_workspace()
+        Each topic runs animate_single() in a worker thread, with at most
+        max_concurrency topics in flight. A topic that raises is reported as a
+        failed AnimationResult instead of cancelling the others.
 
-            # Create a fresh agent for each topic
-            agent = self._create_agent()
+        Returns:
+            List of AnimationResult objects in the order of topic_indices.
+        """
+        if topic_indices is None:
+            topic_indices = list(range(len(storyboards)))
 
-            # Format the prompt for this topic
-            prompt = format_storyboard_prompt(breakdown, storyboard, topic_idx)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        format_prompt = make_storyboard_formatter(breakdown)
 
-            # Run the agent
-            if on_progress:
-                on_progress(topic_idx, 0, "Running coding agent...")
-
-            if ratelimit > 0:
-                time.sleep(ratelimit)
-            result = agent.invoke({"messages": [{"role": "user", "content": prompt}]})
-
-            # Try to render
-            manim_result = self._render_scene()
-            success = self._check_render_success()
-
-            iteration = 0
-            while not success and iteration < max_iterations:
-                iteration += 1
-                if on_progress:
-                    on_progress(topic_idx, iteration, f"Render failed, retrying (iteration {iteration}/{max_iterations})...")
-
-                # Send error back to agent
-                history = copy.deepcopy(result["messages"])
-                history.append({"role": "user", "content": manim_result.stderr})
-                result = agent.invoke({"messages": history})
-                if ratelimit > 0:
-                    time.sleep(ratelimit)
-                manim_result = self._render_scene()
-                success = self._check_render_success()
-
-            # Collect results
-            scene_file = self.animation_workspace_path / "scene.py"
-            scene_code = scene_file.read_text() if scene_file.exists() else None
-
-            if success:
-                video_path = self._get_video_path()
-
-                # Copy video to rendered_videos folder
-                if video_path is not None:
-                    sanitized_name = self._sanitize_filename(topic_name)
-                    output_file = self.rendered_videos_path / f"{sanitized_name}_{topic_idx}.mp4"
-                    shutil.copy(video_path, output_file)
-                    video_path = output_file
-
-                if on_progress:
-                    on_progress(topic_idx, iteration, f"Success! Video saved to {video_path}")
-
-                results.append(AnimationResult(
-                    topic_index=topic_idx,
-                    topic_name=topic_name,
-                    success=True,
-                    video_path=video_path,
-                    scene_code=scene_code,
-                    iterations=iteration,
-                ))
-            else:
-                if on_progress:
-                    on_progress(topic_idx, iteration, f"Failed after {iteration} iterations")
+        async def animate_topic(topic_idx: int) -> AnimationResult:
+            missing = self._missing_topic_result(breakdown, storyboards, topic_idx)
+            if missing is not None:
+                return missing
 
-                results.append(AnimationResult(
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.animate_single,
+                    breakdown=breakdown,
+                    storyboard=storyboards[topic_idx],
                     topic_index=topic_idx,
-                    topic_name=topic_name,
-                    success=False,
-                    scene_code=scene_code,
-                    error_message=manim_result.stderr if manim_result else "Unknown error",
-                    iterations=iteration,
-                ))
+                    max_iterations=max_iterations,
+                    on_progress=on_progress,
+                    ratelimit=ratelimit,
+                    format_prompt=format_prompt,
+                )
+
+        outcomes = await asyncio.gather(
+            *(animate_topic(topic_idx) for topic_idx in topic_indices),
+            return_exceptions=True,
+        )
 
+        results: list[AnimationResult] = []
+        for topic_idx, outcome in zip(topic_indices, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = self._error_topic_result(breakdown, topic_idx, outcome)
+            results.append(outcome)
         return results
 
 
@@ -0,0 +1,63 @@
+"""Compact index of the Manim reference docs for the coding agent's prompt."""
+
+import pathlib
+import re
+
+_CLASS_HEADER_RE = re.compile(r"^### \*class\* (\w+)\(")
+# [`Text`](manim.mobject.text.text_mobject.Text.md#...) -> Text
+_MD_LINK_RE = re.compile(r"\[`?([^`\]]+)`?\]\([^)]*\)")
+
+
+def build_manim_index(docs_root: str | pathlib.Path) -> str:
+    """Build a one-line-per-class index of manim_docs/reference/.
+
+    Each line gives the class name, the first sentence of its description and
+    the file documenting it, so the agent can pick the right file without
+    globbing and grepping the reference folder first.
+
+    Args:
+        docs_root: Path to the manim_docs/ folder.
+
+    Returns:
+        A markdown section to append to the agent's system prompt, or an
+        empty string if no reference docs were found.
+    """
+    entries = []
+    for doc_file in sorted(pathlib.Path(docs_root, "reference").glob("manim.*.md")):
+        # Private modules (manim._config...) are not part of the user API
+        if doc_file.name.startswith("manim._"):
+            continue
+
+        lines = doc_file.read_text().splitlines()
+        for i, line in enumerate(lines):
+            header = _CLASS_HEADER_RE.match(line)
+            if header:
+                break
+        else:
+            continue
+
+        # The description is the first plain paragraph after the "Bases:" line
+        paragraph: list[str] = []
+        for line in lines[i + 1:]:
+            line = line.strip()
+            if not paragraph and (not line or line.startswith("Bases:")):
+                continue
+            if not line or line.startswith(("#", "*", "|")):
+                break
+            paragraph.append(line)
+        description = _MD_LINK_RE.sub(r"\1", " ".join(paragraph)).split(". ")[0].rstrip(".")
+        if description:
+            description += "."
+
+        entries.append(f"- `{header.group(1)}`: {description} ({doc_file.name})")
+
+    if not entries:
+        return ""
+
+    return (
+        "\n\n## Manim API Index\n"
+        "Every class documented in `./manim_docs/reference/`, with a one-line summary and the file "
+        "that has its full parameters and examples. Check this index before searching with `glob` "
+        "or `grep`, then `read_file` the listed file to confirm the exact API.\n\n"
+        + "\n".join(entries)
+    )
@@ -89,6 +89,14 @@ class TopicStoryboard(BaseModel):
     )
 
 
+class StoryboardBatch(BaseModel):
+    """Storyboards for several topics generated in a single request."""
+
+    storyboards: list[TopicStoryboard] = Field(
+        description="One storyboard per input topic, in the same order as the topics were given"
+    )
+
+
 class AnimationResult(BaseModel):
     """Result of an animation generation attempt."""
 
@@ -4,9 +4,10 @@ from maniflow.prompts.animate import (
     MANIM_CODING_AGENT_PROMPT,
     SCENE_BOILERPLATE,
     format_storyboard_prompt,
+    make_storyboard_formatter,
 )
 from maniflow.prompts.breakdown import BREAKDOWN_PROMPT
-from maniflow.prompts.storyboard import STORYBOARD_PROMPT, format_topic_input
+from maniflow.prompts.storyboard import STORYBOARD_PROMPT, format_topic_batch_input, format_topic_input
 
 __all__ = [
     "BREAKDOWN_PROMPT",
@@ -14,6 +15,8 @@ __all__ = [
     "SCENE_BOILERPLATE",
     "STORYBOARD_PROMPT",
     "format_storyboard_prompt",
+    "format_topic_batch_input",
     "format_topic_input",
+    "make_storyboard_formatter",
 ]
 
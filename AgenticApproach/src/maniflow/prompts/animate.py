@@ -1,5 +1,8 @@
 """Prompts for Manim animation generation."""
 
+import functools
+from typing import Any, Callable
+
 MANIM_CODING_AGENT_PROMPT = """You are an Expert Manim Animator creating detailed educational videos with access to documentation and a workspace.
 
 ## Your Goal
@@ -73,7 +76,7 @@ class MyScene(VoiceoverScene):
 **EVERY scene MUST have a "Concept Caption" text bar at the bottom of the screen** that highlights the key concept being shown:
 - Create a semi-transparent dark rectangle at the bottom (spanning full width, ~1 unit tall)
 - Display the key concept/idea as white text on this bar (font_size 20-24)
-- Update this caption text when the concept changes using ReplacementTransform or FadeOut/FadeIn (NOT Transform, which causes overlap issues)
+- Update this caption text when the concept changes with a short cross-fade: `self.play(FadeOut(old_caption), FadeIn(new_caption), run_time=0.3)`, then keep a reference to the new caption (NOT Transform, which causes overlap issues and morphs every glyph outline frame by frame)
 - Position: `DOWN * 3.5` to `DOWN * 4.0` (bottom area of the 8-unit tall frame)
 - Example concepts: "Residual connections preserve gradient flow", "Matrix multiplication combines features", "Softmax normalizes attention weights"
 - Keep captions concise but informative (1-2 sentences max)
@@ -148,6 +151,19 @@ You have documentation tools available and you MUST use them before writing any
 - **Reserve bottom 1-1.25 units for the concept caption bar**
 - Take advantage of the wider frame for showing more content simultaneously
 
+## Rendering Efficiency
+Rendering time grows with every mobject Manim has to build and draw. Keep the richness, but avoid redundant work:
+- **Build repeated text once**: `Text` runs font shaping and `MathTex` parses a compiled SVG on every construction. When a helper (e.g. a caption updater) or several storyboard scenes create the same string more than once (e.g. `r"f'(x)"`), keep a small dict cache keyed by `(text, font_size, color)` and use `.copy()` of the cached mobject
+- **Construct static code blocks once**: `Code(...)` lexes the snippet and shapes every glyph. Create each code block a single time, before the voiceover block that first shows it, and reuse that mobject (or `.copy()` it) instead of rebuilding it later
+- **Copy recurring diagrams**: If the same composite diagram (e.g. a network, a memory block, a brain icon, a `ComplexPlane` or `Axes` grid) appears in several storyboard scenes, build it once near the top of `construct()` and `.copy()` it into each later scene
+- **Batch many identical strokes**: For dozens of plain line segments that always move together (rays, hatching, network edges), build one `VMobject` and add each segment with `start_new_path(start)` + `add_line_to(end)` instead of a `VGroup` of separate `Line` objects
+- **Group sibling animations**: When several objects fade, appear, or get created together, animate them as one group (`self.play(FadeOut(VGroup(a, b, c, d)))`) instead of listing `FadeOut(a), FadeOut(b), ...` — one animation to update per frame instead of many. To clear the screen between storyboard scenes, use `self.play(FadeOut(Group(*self.mobjects)))` rather than `FadeOut(*self.mobjects)`
+- **Stagger in one play, not a loop of plays**: Every `self.play` writes and later concatenates its own partial movie file. To reveal a series of similar objects one after another (dots, bars, list items), use a single `self.play(LaggedStart(*[Create(d) for d in dots], lag_ratio=0.3))` instead of calling `self.play` inside a loop. Likewise, back-to-back plays with the same `run_time` that could happen together (e.g. `Write(u_def)` then `Write(v_def)`) belong in one `self.play(Write(u_def), Write(v_def))`
+- **One tracker instead of many short plays**: To sweep a parameter through several values (a secant approaching a tangent, a point sliding along a curve), drive the dependent objects from a `ValueTracker` with `always_redraw` or `add_updater`, and animate it in a single `self.play(tracker.animate.set_value(end))` instead of a loop of short `Transform` plays. For a moving `Line`, update it in place with `line.add_updater(lambda l: l.put_start_and_end_on(p1, p2()))` rather than rebuilding it with `always_redraw`
+- **Move objects, don't replace them**: When only an object's position changes, animate it with `dot.animate.move_to(new_point)` instead of `Transform(dot, Dot(new_point, ...))` — no throwaway mobject is built and the shape is not re-interpolated
+- **Vectorized plots**: When a plotted function is plain NumPy arithmetic (e.g. `lambda x: -x**2 + 8*x - 12`), pass `use_vectorized=True` to `axes.plot(...)` so the whole sample array is evaluated in one call instead of point by point. Draw constant or linear functions (e.g. a constant acceleration) as a `Line` between two `axes.c2p(...)` points instead of sampling them with `plot`
+- **Seeded, vectorized randomness**: For scattered or random layouts, create one `rng = np.random.default_rng(42)` at the top of `construct()` and draw all positions at once (e.g. `rng.uniform(-1, 1, size=(40, 2))`) instead of calling `random.*` inside loops — re-renders after a fix then produce the same layout
+
 ## Detail & Richness Checklist
 Before finalizing your code, verify:
 - [ ] Scene inherits from VoiceoverScene with KokoroService initialized
@@ -188,6 +204,45 @@ from kokoro_mv import KokoroService
 """
 
 
+def _format_document_context(breakdown) -> str:
+    """Format the document header, which is the same for every topic.
+
+    It opens every topic's prompt, so the prompts share one identical prefix.
+    """
+    return f"""# Document Context
+**Document:** {breakdown.document_title}
+**Summary:** {breakdown.document_summary}
+"""
+
+
+def _format_storyboard_scenes(storyboard) -> str:
+    """Format the storyboard's scenes as markdown sections."""
+    return "".join(
+        f"## Scene {i+1}\n"
+        f"**Visual Description:** {scene.visual_description}\n"
+        f"**Narration (use in voiceover):** \"{scene.narration}\"\n\n"
+        for i, scene in enumerate(storyboard.scenes)
+    )
+
+
+def make_storyboard_formatter(breakdown) -> Callable[[Any, int], str]:
+    """Build a storyboard prompt formatter specialized to one breakdown.
+
+    The parts that depend only on the breakdown (document header, topic list)
+    are rendered once; the returned function fills in the per-topic parts.
+
+    Args:
+        breakdown: The Breakdown object containing all topics.
+
+    Returns:
+        A function (storyboard, topic_index) -> prompt, equivalent to
+        format_storyboard_prompt(breakdown, storyboard, topic_index).
+    """
+    document_context = _format_document_context(breakdown)
+    topic_lines = [f"{i + 1}. {topic.name}\n" for i, topic in enumerate(breakdown.topics)]
+    return functools.partial(_format_topic_prompt, breakdown, document_context, topic_lines)
+
+
 def format_storyboard_prompt(
     breakdown,
     storyboard,
@@ -203,44 +258,51 @@ def format_storyboard_prompt(
     Returns:
         Formatted prompt string for the animation agent.
     """
+    return make_storyboard_formatter(breakdown)(storyboard, topic_index)
+
+
+def _format_topic_prompt(
+    breakdown,
+    document_context: str,
+    topic_lines: list[str],
+    storyboard,
+    topic_index: int,
+) -> str:
+    """Fill in the per-topic parts of the prompt; see make_storyboard_formatter()."""
     current_topic = breakdown.topics[topic_index]
-    total_topics = len(breakdown.topics)
+    total_topics = len(topic_lines)
     previous_topic = breakdown.topics[topic_index - 1] if topic_index > 0 else None
     next_topic = breakdown.topics[topic_index + 1] if topic_index < total_topics - 1 else None
 
     # Convert storyboard scenes to text
-    storyboard_text = ""
-    for i, scene in enumerate(storyboard.scenes):
-        storyboard_text += f"## Scene {i+1}\n"
-        storyboard_text += f"**Visual Description:** {scene.visual_description}\n"
-        storyboard_text += f"**Narration (use in voiceover):** \"{scene.narration}\"\n\n"
+    storyboard_text = _format_storyboard_scenes(storyboard)
 
     # Build series context
-    series_context = f"""# Document Context
-**Document:** {breakdown.document_title}
-**Summary:** {breakdown.document_summary}
-
+    series_context = document_context + f"""
 # Series Navigation
 This is **Part {topic_index + 1} of {total_topics}** in the series on "{breakdown.document_title}".
 
 **All Topics in Series:**
 """
-    for i, topic in enumerate(breakdown.topics):
-        marker = "👉 " if i == topic_index else "   "
-        series_context += f"{marker}{i + 1}. {topic.name}\n"
+    series_parts = [series_context]
+    series_parts.extend(
+        ("👉 " if i == topic_index else "   ") + topic_line
+        for i, topic_line in enumerate(topic_lines)
+    )
 
     # Previous/Next topic info
     if previous_topic:
-        series_context += f"""
+        series_parts.append(f"""
 **Previous Topic (Part {topic_index}):** {previous_topic.name}
 - Summary: {previous_topic.summary}
-"""
+""")
 
     if next_topic:
-        series_context += f"""
+        series_parts.append(f"""
 **Next Topic (Part {topic_index + 2}):** {next_topic.name}
 - Summary: {next_topic.summary}
-"""
+""")
+    series_context = "".join(series_parts)
 
     # Topic details from breakdown
     topic_context = f"""
@@ -253,8 +315,7 @@ This is **Part {topic_index + 1} of {total_topics}** in the series on "{breakdow
 
 **Key Takeaways:**
 """
-    for takeaway in current_topic.key_takeaways:
-        topic_context += f"- {takeaway}\n"
+    topic_context += "".join(f"- {takeaway}\n" for takeaway in current_topic.key_takeaways)
 
     # Get topic name for caption
     topic_name_short = storyboard.topic_name.split(':')[0] if ':' in storyboard.topic_name else storyboard.topic_name
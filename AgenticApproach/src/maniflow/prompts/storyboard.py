@@ -111,3 +111,22 @@ def format_topic_input(topic) -> str:
         "## AtomicTopic Input\n\n"
         f"{topic.to_text()}\n"
     )
+
+
+def format_topic_batch_input(topics) -> str:
+    """Format several AtomicTopics into one prompt input string.
+
+    Args:
+        topics: AtomicTopic objects to storyboard in a single request.
+
+    Returns:
+        A formatted string ready to append to the storyboard prompt.
+    """
+    parts = [
+        f"# Create one storyboard for EACH of the following {len(topics)} topics\n"
+        "Return the storyboards in the same order as the topics below. "
+        "Each storyboard must stand on its own and follow all of the guidelines above.\n"
+    ]
+    for i, topic in enumerate(topics, start=1):
+        parts.append(f"## AtomicTopic Input {i} of {len(topics)}\n\n{topic.to_text()}\n")
+    return "\n".join(parts)